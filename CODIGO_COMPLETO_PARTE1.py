@@ -35,17 +35,22 @@ langgraph-resource-manager/
 ## 📦 requirements.txt
 
 ```txt
-fastapi==0.109.0
-uvicorn==0.27.0
-langgraph==0.0.43
-langchain==0.1.6
-langchain-anthropic==0.1.4
-pydantic==2.5.3
-httpx==0.26.0
+fastapi==0.110.0
+uvicorn[standard]==0.27.0
+gunicorn==21.2.0
+orjson==3.9.15
+langgraph==0.2.0
+langgraph-checkpoint-sqlite==1.0.0
+langchain==0.2.12
+langchain-anthropic==0.1.22
+pydantic==2.6.0
+numpy==1.26.4
+httpx==0.25.2
 python-dotenv==1.0.0
 supabase==2.3.4
 pytest==7.4.4
 pytest-asyncio==0.23.3
+anthropic==0.31.0
 ```
 
 ---
@@ -57,9 +62,9 @@ pytest-asyncio==0.23.3
 Estado compartilhado entre todos os agentes.
 TypedDict garante type safety e validação.
 """
-from typing import TypedDict, List, Dict, Optional, Literal
+from typing import Annotated, Any, TypedDict, List, Dict, Optional, Literal
 from datetime import date, datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 # ============================================================================
@@ -86,6 +91,12 @@ class Resource(BaseModel):
     department: Optional[str] = None
     skill_tags: List[str] = []
 
+    @field_validator("email", mode="after")
+    @classmethod
+    def _normalize_email(cls, v: str) -> str:
+        """Normaliza email na construção (chave de consolidação)"""
+        return v.lower().strip()
+
 
 class Assignment(BaseModel):
     """Modelo de atribuição"""
@@ -181,19 +192,29 @@ class Feedback(BaseModel):
     manager_rating: int = Field(ge=1, le=5)
     implementation_result: Literal["success", "partial", "failed"]
     effectiveness_score: float = Field(ge=0.0, le=1.0)
-    context: Dict[str, any]
+    context: Dict[str, Any]
 
 
 # ============================================================================
 # AGENT STATE (Estado compartilhado no grafo)
 # ============================================================================
 
+def _merge_dicts(left: Dict, right: Dict) -> Dict:
+    """
+    Reducer do LangGraph para campos dict.
+    
+    Cada nó retorna apenas as chaves novas; o LangGraph mescla
+    com o valor atual do estado.
+    """
+    return {**left, **right}
+
+
 class AgentState(TypedDict, total=False):
     """
     Estado compartilhado entre todos os agentes.
     
-    Todos os agentes leem e modificam este estado.
-    LangGraph garante sincronização automática.
+    Todos os agentes leem este estado e retornam apenas as chaves
+    que alteraram. LangGraph mescla as atualizações automaticamente.
     """
     # Identificação
     execution_id: str
@@ -229,14 +250,14 @@ class AgentState(TypedDict, total=False):
     
     # Agentes de Aprendizado
     feedback_history: List[Feedback]
-    patterns: Dict[str, any]
+    patterns: Dict[str, Any]
     
     # Controle de fluxo
     should_continue: bool
     trigger_pattern_analysis: bool
     
     # Metadata
-    timestamps: Dict[str, datetime]
+    timestamps: Annotated[Dict[str, datetime], _merge_dicts]
     errors: List[str]
 
 
@@ -290,12 +311,24 @@ Responsabilidade:
 from typing import Dict
 from ..models.state import AgentState, ConsolidatedResource, Assignment
 from datetime import datetime
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
 
-def consolidator_agent(state: AgentState) -> AgentState:
+async def consolidator_agent(state: AgentState) -> AgentState:
+    """
+    Nó LangGraph assíncrono do consolidador.
+    
+    A consolidação é CPU-bound: roda em uma thread para não bloquear
+    o event loop (outros nós/requisições seguem em paralelo).
+    """
+    return await asyncio.to_thread(_consolidate, state)
+
+
+def _consolidate(state: AgentState) -> AgentState:
     """
     Consolida recursos de múltiplos projetos.
     
@@ -304,7 +337,7 @@ def consolidator_agent(state: AgentState) -> AgentState:
     2. Agrupa todas as atribuições do mesmo recurso
     3. Remove duplicatas
     """
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     logger.info(
         f"[CONSOLIDATOR] Starting consolidation for execution {state['execution_id']}"
     )
@@ -312,32 +345,33 @@ def consolidator_agent(state: AgentState) -> AgentState:
     resources = state.get("resources", [])
     assignments = state.get("assignments", [])
     
+    # Índice por id (lookup O(1))
+    by_id = {r.id: r for r in resources}
+    
     # Mapa: email → ConsolidatedResource
     resource_map: Dict[str, ConsolidatedResource] = {}
     
     # Primeiro, criar mapa de recursos únicos
     for resource in resources:
-        email_key = resource.email.lower().strip()
+        email_key = resource.email  # já normalizado pelo modelo Resource
         
         if email_key not in resource_map:
-            resource_map[email_key] = ConsolidatedResource(
+            # Resource já foi validado pelo Pydantic: pular revalidação
+            resource_map[email_key] = ConsolidatedResource.model_construct(
                 id=resource.id,
                 name=resource.name,
                 email=email_key,
                 role=resource.role,
                 capacity=resource.max_capacity_hours_per_day,
                 department=resource.department,
-                skills=resource.skill_tags,
+                skills=list(resource.skill_tags),
                 assignments=[]
             )
     
     # Segundo, agregar assignments por recurso
     for assignment in assignments:
         # Encontrar recurso correspondente
-        resource = next(
-            (r for r in resources if r.id == assignment.resource_id),
-            None
-        )
+        resource = by_id.get(assignment.resource_id)
         
         if not resource:
             logger.warning(
@@ -345,7 +379,7 @@ def consolidator_agent(state: AgentState) -> AgentState:
             )
             continue
         
-        email_key = resource.email.lower().strip()
+        email_key = resource.email
         
         if email_key in resource_map:
             resource_map[email_key].assignments.append(assignment)
@@ -358,7 +392,7 @@ def consolidator_agent(state: AgentState) -> AgentState:
         len(r.assignments) for r in consolidated_resources
     )
     
-    elapsed = (datetime.now() - start_time).total_seconds()
+    elapsed = time.perf_counter() - start_time
     
     logger.info(
         f"[CONSOLIDATOR] Consolidated {len(resources)} resources into "
@@ -366,15 +400,11 @@ def consolidator_agent(state: AgentState) -> AgentState:
         f"{total_assignments} assignments in {elapsed:.2f}s"
     )
     
-    # Atualizar estado
+    # Atualização parcial do estado (LangGraph mescla)
     return {
-        **state,
         "consolidated_resources": consolidated_resources,
         "stage": "consolidation_complete",
-        "timestamps": {
-            **state.get("timestamps", {}),
-            "consolidation_complete": datetime.now()
-        }
+        "timestamps": {"consolidation_complete": datetime.now()}
     }
 
 
@@ -441,7 +471,7 @@ def test_consolidator_agent():
     state["assignments"] = assignments
     
     # Executar agente
-    result = consolidator_agent(state)
+    result = asyncio.run(consolidator_agent(state))
     
     # Assertions
     assert len(result["consolidated_resources"]) == 1  # Consolidado em 1
@@ -471,13 +501,38 @@ Responsabilidade:
 - Detectar superalocações (allocatedHours > capacity)
 - Classificar severidade dos conflitos
 """
-from typing import Dict, List
-from datetime import date, timedelta, datetime
-from ..models.state import AgentState, Conflict, TaskInvolvement
+from typing import List, Optional, Set, Tuple
+from collections import namedtuple
+from enum import IntEnum
+from operator import itemgetter
+from datetime import date, datetime
+from ..models.state import (
+    AgentState, ConsolidatedResource, Conflict, TaskInvolvement
+)
+from .consolidator import _consolidate
+import numpy as np
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Tarefa durante a acumulação (tupla leve, sem validação Pydantic)
+_TaskHours = namedtuple("_TaskHours", "project_id task_id task_name hours")
+
+
+class Severity(IntEnum):
+    """Severidade com ordem natural (maior = mais grave)"""
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
+
+
+# Limites entre severidades (mesmos de classify_severity), em ordem
+SEVERITY_BINS = np.array([25.0, 50.0, 100.0])
+_SEVERITY_BY_BIN = tuple(Severity)
+
 
 def get_business_days(start_date: date, end_date: date) -> int:
     """
@@ -488,16 +543,8 @@ def get_business_days(start_date: date, end_date: date) -> int:
     if start_date > end_date:
         return 0
     
-    count = 0
-    current = start_date
-    
-    while current <= end_date:
-        # 0 = Segunda, 6 = Domingo
-        if current.weekday() < 5:  # Segunda a Sexta
-            count += 1
-        current += timedelta(days=1)
-    
-    return count
+    # busday_count usa intervalo semiaberto [start, end)
+    return int(np.busday_count(start_date, np.datetime64(end_date, "D") + 1))
 
 
 def classify_severity(overallocation_percent: float) -> str:
@@ -519,131 +566,266 @@ def classify_severity(overallocation_percent: float) -> str:
         return "CRITICAL"
 
 
-def detector_agent(state: AgentState) -> AgentState:
+def find_overallocations(
+    hours: np.ndarray,
+    capacity: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Núcleo numérico da detecção (vetorizado).
+    
+    Retorna:
+        (índices dos dias em conflito, horas alocadas, % de superalocação)
+    """
+    conflict_days = np.flatnonzero(hours > capacity)
+    allocated = hours[conflict_days]
+    overallocation_percent = (allocated - capacity) / capacity * 100
+    
+    return conflict_days, allocated, overallocation_percent
+
+
+def detect_resource_conflicts(
+    resource: ConsolidatedResource,
+    busday_mask: np.ndarray,
+    global_start: date,
+    hours: Optional[np.ndarray] = None
+) -> List[Tuple[Severity, float, Conflict]]:
+    """
+    Detecta os conflitos de um único recurso.
+    
+    Independente dos demais recursos: depende apenas do recurso e da
+    máscara de dias úteis da janela que começa em global_start.
+    
+    Args:
+        hours: Opcional. Buffer reutilizável do tamanho de busday_mask;
+            é zerado aqui e evita uma alocação por recurso.
+    
+    Retorna (severidade, percentual, conflito), chave de ordenação
+    já calculada.
+    """
+    conflicts: List[Tuple[Severity, float, Conflict]] = []
+    
+    if not resource.assignments:
+        return conflicts
+    
+    # Structure-of-Arrays: horas alocadas por dia, indexadas pelo offset
+    # inteiro (ordinal da data - ordinal de global_start)
+    origin = global_start.toordinal()
+    if hours is None:
+        hours = np.zeros(len(busday_mask))
+    else:
+        hours.fill(0.0)
+    spans = []  # (início, fim, tarefa) para detalhar conflitos
+    
+    # Datas de todas as atribuições como datetime64 (fim exclusivo)
+    starts = np.array(
+        [a.start_date for a in resource.assignments], dtype="datetime64[D]"
+    )
+    ends = np.array(
+        [a.end_date for a in resource.assignments], dtype="datetime64[D]"
+    ) + 1
+    
+    # Dias úteis e offsets [start_idx, end_idx) calculados de uma vez
+    all_business_days = np.busday_count(starts, ends).tolist()
+    base = np.datetime64(global_start, "D")
+    start_idxs = (starts - base).astype(np.int64).tolist()
+    end_idxs = (ends - base).astype(np.int64).tolist()
+    
+    # Processar cada assignment
+    for assignment, business_days, start_idx, end_idx in zip(
+        resource.assignments,
+        all_business_days,
+        start_idxs,
+        end_idxs
+    ):
+        # busday_count é negativo quando start_date > end_date
+        if business_days <= 0:
+            logger.warning(
+                f"Assignment {assignment.id} has no business days"
+            )
+            continue
+        
+        # Horas por dia útil
+        hours_per_day = assignment.total_work_hours / business_days
+        
+        # Distribuir pelos dias úteis do intervalo [start_idx, end_idx)
+        window = hours[start_idx:end_idx]
+        window[busday_mask[start_idx:end_idx]] += hours_per_day
+        
+        spans.append((
+            start_idx,
+            end_idx,
+            _TaskHours(
+                assignment.project_id,
+                assignment.task_id,
+                assignment.task_name,
+                hours_per_day
+            )
+        ))
+    
+    # Detectar conflitos (uma comparação vetorizada)
+    conflict_days, allocated, percents = find_overallocations(
+        hours,
+        resource.capacity
+    )
+    
+    if conflict_days.size == 0:
+        return conflicts
+    
+    # Classificar severidade de todos os dias de uma vez
+    severities = [
+        _SEVERITY_BY_BIN[i] for i in np.digitize(percents, SEVERITY_BINS).tolist()
+    ]
+    
+    # Montar tarefas apenas para os dias em conflito
+    tasks_per_day: List[List[TaskInvolvement]] = [[] for _ in conflict_days]
+    projects_per_day: List[Set[str]] = [set() for _ in conflict_days]
+    
+    for start_idx, end_idx, task in spans:
+        first, stop = np.searchsorted(conflict_days, (start_idx, end_idx))
+        if first == stop:
+            continue
+        
+        # Um único TaskInvolvement por atribuição, compartilhado pelos dias
+        # em conflito (valores já validados no Assignment de origem)
+        involvement = TaskInvolvement.model_construct(**task._asdict())
+        for k in range(first, stop):
+            tasks_per_day[k].append(involvement)
+            projects_per_day[k].add(task.project_id)
+    
+    for day_idx, total_hours, overallocation_percent, severity, tasks, projects in zip(
+        conflict_days.tolist(),
+        allocated.tolist(),
+        percents.tolist(),
+        severities,
+        tasks_per_day,
+        projects_per_day
+    ):
+        overallocation_hours = total_hours - resource.capacity
+        percent = round(overallocation_percent, 1)
+        
+        # Todos os campos derivam de entradas já validadas
+        conflict = Conflict.model_construct(
+            resource_id=resource.id,
+            resource_name=resource.name,
+            conflict_date=date.fromordinal(origin + day_idx),
+            allocated_hours=round(total_hours, 2),
+            capacity_hours=resource.capacity,
+            overallocation_hours=round(overallocation_hours, 2),
+            overallocation_percent=percent,
+            severity=severity.name,
+            tasks_involved=tasks,
+            projects_count=len(projects)
+        )
+        
+        conflicts.append((severity, percent, conflict))
+    
+    return conflicts
+
+
+async def detector_agent(state: AgentState) -> AgentState:
+    """
+    Nó LangGraph assíncrono do detector.
+    
+    A detecção é CPU-bound: roda em uma thread para não bloquear
+    o event loop (outros nós/requisições seguem em paralelo).
+    """
+    return await asyncio.to_thread(_detect, state)
+
+
+def _detect(state: AgentState) -> AgentState:
     """
     Detecta conflitos de superalocação.
     
     Algoritmo:
     1. Para cada recurso consolidado:
-       a. Criar mapa de alocação diária
+       a. Criar vetor de horas por dia (numpy, indexado por offset)
        b. Para cada assignment, distribuir horas pelos dias úteis
        c. Detectar dias onde total > capacidade
     2. Classificar severidade
     3. Ordenar por severidade e percentual
     """
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     logger.info(
         f"[DETECTOR] Starting conflict detection for execution {state['execution_id']}"
     )
     
     consolidated_resources = state.get("consolidated_resources", [])
-    conflicts: List[Conflict] = []
+    ranked: List[Tuple[Severity, float, Conflict]] = []
     
-    for resource in consolidated_resources:
-        # Mapa: date_string → { date, tasks[], totalHours }
-        daily_allocation: Dict[str, Dict] = {}
-        
-        # Processar cada assignment
-        for assignment in resource.assignments:
-            business_days = get_business_days(
-                assignment.start_date,
-                assignment.end_date
-            )
-            
-            if business_days == 0:
-                logger.warning(
-                    f"Assignment {assignment.id} has no business days"
-                )
-                continue
-            
-            # Horas por dia útil
-            hours_per_day = assignment.total_work_hours / business_days
-            
-            # Distribuir pelas datas
-            current_date = assignment.start_date
-            while current_date <= assignment.end_date:
-                # Pular fins de semana
-                if current_date.weekday() < 5:
-                    date_key = current_date.isoformat()
-                    
-                    # Inicializar dia se não existe
-                    if date_key not in daily_allocation:
-                        daily_allocation[date_key] = {
-                            "date": current_date,
-                            "tasks": [],
-                            "total_hours": 0.0
-                        }
-                    
-                    # Adicionar tarefa ao dia
-                    day = daily_allocation[date_key]
-                    day["tasks"].append(
-                        TaskInvolvement(
-                            project_id=assignment.project_id,
-                            task_id=assignment.task_id,
-                            task_name=assignment.task_name,
-                            hours=hours_per_day
-                        )
-                    )
-                    day["total_hours"] += hours_per_day
-                
-                current_date += timedelta(days=1)
-        
-        # Detectar conflitos
-        for date_key, day in daily_allocation.items():
-            if day["total_hours"] > resource.capacity:
-                overallocation_hours = day["total_hours"] - resource.capacity
-                overallocation_percent = (
-                    overallocation_hours / resource.capacity
-                ) * 100
-                
-                conflict = Conflict(
-                    resource_id=resource.id,
-                    resource_name=resource.name,
-                    conflict_date=day["date"],
-                    allocated_hours=round(day["total_hours"], 2),
-                    capacity_hours=resource.capacity,
-                    overallocation_hours=round(overallocation_hours, 2),
-                    overallocation_percent=round(overallocation_percent, 1),
-                    severity=classify_severity(overallocation_percent),
-                    tasks_involved=day["tasks"],
-                    projects_count=len(
-                        set(task.project_id for task in day["tasks"])
-                    )
-                )
-                
-                conflicts.append(conflict)
-    
-    # Ordenar por severidade e percentual
-    severity_order = {"CRITICAL": 4, "HIGH": 3, "MEDIUM": 2, "LOW": 1}
-    conflicts.sort(
-        key=lambda c: (
-            -severity_order[c.severity],  # Maior severidade primeiro
-            -c.overallocation_percent     # Maior percentual primeiro
+    # Janela da execução, estendida para cobrir todas as atribuições
+    global_start = min(
+        [state["start_date"]]
+        + [a.start_date for r in consolidated_resources for a in r.assignments]
+    )
+    global_end = max(
+        [state["end_date"]]
+        + [a.end_date for r in consolidated_resources for a in r.assignments]
+    )
+    
+    # Máscara de dias úteis (Segunda a Sexta) calculada uma única vez
+    busday_mask = np.is_busday(
+        np.arange(
+            np.datetime64(global_start, "D"),
+            np.datetime64(global_end, "D") + 1
         )
     )
     
+    # Buffer de horas reaproveitado entre recursos
+    hours = np.empty(len(busday_mask))
+    
+    for resource in consolidated_resources:
+        ranked.extend(
+            detect_resource_conflicts(resource, busday_mask, global_start, hours)
+        )
+    
+    # Ordenar por severidade e percentual (maiores primeiro; sort estável)
+    ranked.sort(key=itemgetter(0, 1), reverse=True)
+    conflicts = [conflict for _, _, conflict in ranked]
+    
     # Estatísticas
     critical_conflicts = sum(
-        1 for c in conflicts if c.severity == "CRITICAL"
+        1 for severity, _, _ in ranked if severity == Severity.CRITICAL
     )
     
-    elapsed = (datetime.now() - start_time).total_seconds()
+    elapsed = time.perf_counter() - start_time
     
     logger.info(
         f"[DETECTOR] Detected {len(conflicts)} conflicts "
         f"({critical_conflicts} CRITICAL) in {elapsed:.2f}s"
     )
     
-    # Atualizar estado
+    # Atualização parcial do estado (LangGraph mescla)
     return {
-        **state,
         "conflicts": conflicts,
         "total_conflicts": len(conflicts),
         "critical_conflicts": critical_conflicts,
         "stage": "detection_complete",
+        "timestamps": {"detection_complete": datetime.now()}
+    }
+
+
+async def consolidate_and_detect_agent(state: AgentState) -> AgentState:
+    """
+    Nó fundido: Agente 1 + Agente 2 em um único passo do grafo.
+    
+    Evita um salto de thread, uma mesclagem de estado e um checkpoint
+    intermediário. A consolidação continua materializando as atribuições
+    por recurso, pois o loop de feedback reexecuta apenas "detect".
+    """
+    return await asyncio.to_thread(_consolidate_and_detect, state)
+
+
+def _consolidate_and_detect(state: AgentState) -> AgentState:
+    """Consolida e detecta conflitos na mesma thread"""
+    consolidation = _consolidate(state)
+    detection = _detect({**state, **consolidation})
+    
+    return {
+        **consolidation,
+        **detection,
         "timestamps": {
-            **state.get("timestamps", {}),
-            "detection_complete": datetime.now()
+            **consolidation["timestamps"],
+            **detection["timestamps"]
         }
     }
 
@@ -701,7 +883,7 @@ def test_detector_agent():
     state["consolidated_resources"] = [resource]
     
     # Executar agente
-    result = detector_agent(state)
+    result = asyncio.run(detector_agent(state))
     
     # Assertions
     # Dias 12, 13, 14 = conflito (8h + 8h = 16h > 8h capacity)
@@ -736,16 +918,29 @@ Responsabilidade:
 - Parsear e validar respostas JSON
 - Gerar 2-3 soluções por conflito
 """
-from typing import List
+from typing import List, Optional
 import json
 import re
 from datetime import datetime
 from anthropic import AsyncAnthropic
 from ..models.state import AgentState, Solution, Conflict
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Cliente único por processo: reaproveita o pool HTTP (TLS/keep-alive)
+# entre execuções. Criado no primeiro uso, já dentro do event loop.
+_client: Optional[AsyncAnthropic] = None
+
+
+def get_client() -> AsyncAnthropic:
+    """Retorna o cliente Anthropic compartilhado"""
+    global _client
+    if _client is None:
+        _client = AsyncAnthropic()
+    return _client
+
 
 def build_prompt(conflicts: List[Conflict], max_conflicts: int = 10) -> str:
     """
@@ -764,7 +959,7 @@ def build_prompt(conflicts: List[Conflict], max_conflicts: int = 10) -> str:
 Sua tarefa é analisar conflitos de superalocação e gerar soluções práticas.
 
 CONFLITOS DETECTADOS:
-{json.dumps([c.dict() for c in top_conflicts], indent=2, default=str)}
+{json.dumps([c.model_dump(mode="json") for c in top_conflicts], indent=2)}
 
 Para CADA conflito, você deve gerar 2-3 SOLUÇÕES ALTERNATIVAS usando as seguintes estratégias:
 
@@ -834,7 +1029,7 @@ async def generator_agent(state: AgentState) -> AgentState:
     4. Parsear e validar JSON
     5. Flatten soluções (1 solução = 1 objeto)
     """
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     logger.info(
         f"[GENERATOR] Starting solution generation for execution {state['execution_id']}"
     )
@@ -844,7 +1039,6 @@ async def generator_agent(state: AgentState) -> AgentState:
     if not conflicts:
         logger.warning("[GENERATOR] No conflicts to process")
         return {
-            **state,
             "solutions": [],
             "total_solutions": 0,
             "stage": "generation_complete",
@@ -855,10 +1049,8 @@ async def generator_agent(state: AgentState) -> AgentState:
     prompt = build_prompt(conflicts, max_conflicts=10)
     
     # Chamar Claude
-    client = AsyncAnthropic()
-    
     try:
-        response = await client.messages.create(
+        response = await get_client().messages.create(
             model="claude-sonnet-4-20250514",
             max_tokens=4000,
             temperature=0.3,
@@ -905,7 +1097,7 @@ async def generator_agent(state: AgentState) -> AgentState:
                 )
                 solutions.append(solution)
         
-        elapsed = (datetime.now() - start_time).total_seconds()
+        elapsed = time.perf_counter() - start_time
         
         logger.info(
             f"[GENERATOR] Generated {len(solutions)} solutions "
@@ -913,21 +1105,16 @@ async def generator_agent(state: AgentState) -> AgentState:
         )
         
         return {
-            **state,
             "solutions": solutions,
             "total_solutions": len(solutions),
             "stage": "generation_complete",
-            "timestamps": {
-                **state.get("timestamps", {}),
-                "generation_complete": datetime.now()
-            }
+            "timestamps": {"generation_complete": datetime.now()}
         }
         
     except Exception as e:
         logger.error(f"[GENERATOR] Error: {str(e)}")
         
         return {
-            **state,
             "solutions": [],
             "total_solutions": 0,
             "stage": "generation_failed",
@@ -951,7 +1138,9 @@ Responsabilidade:
 from typing import List, Dict
 from datetime import datetime
 from ..models.state import AgentState, RankedSolution, Solution, Weights
+import numpy as np
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -993,6 +1182,48 @@ def calculate_rank_score(
     return round(rank_score, 3)
 
 
+def solutions_to_soa(solutions: List[Solution]) -> Dict[str, np.ndarray]:
+    """
+    Colunas (Structure-of-Arrays) com os campos usados no ranking.
+    
+    O ranking só lê três campos; arrays contíguos evitam acessar
+    atributo por atributo de cada modelo pydantic.
+    """
+    n = len(solutions)
+    return {
+        "feasibility": np.fromiter(
+            (s.feasibility_score for s in solutions), np.float64, n
+        ),
+        "complexity": np.fromiter(
+            (s.complexity_score for s in solutions), np.float64, n
+        ),
+        "preserves_deadline": np.fromiter(
+            (s.preserves_deadline for s in solutions), np.bool_, n
+        ),
+    }
+
+
+def calculate_rank_scores(
+    soa: Dict[str, np.ndarray],
+    weights: Weights
+) -> np.ndarray:
+    """Versão vetorizada de calculate_rank_score (mesma fórmula e ordem)"""
+    impact_score = 1.0 - soa["complexity"]
+    deadline_score = np.where(soa["preserves_deadline"], 1.0, 0.3)
+    simplicity_score = impact_score
+    
+    rank_scores = (
+        soa["feasibility"] * weights.feasibility +
+        impact_score * weights.impact +
+        deadline_score * weights.deadline +
+        simplicity_score * weights.simplicity
+    )
+    
+    # round() do Python (arredondamento correto); np.round diverge
+    # de calculate_rank_score em alguns valores no limite
+    return np.array([round(score, 3) for score in rank_scores.tolist()])
+
+
 def ranker_agent(state: AgentState) -> AgentState:
     """
     Rankeia soluções aplicando pesos.
@@ -1003,7 +1234,7 @@ def ranker_agent(state: AgentState) -> AgentState:
     3. Ordenar por score (maior primeiro)
     4. Logar top 3
     """
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     logger.info(
         f"[RANKER] Starting ranking for execution {state['execution_id']}"
     )
@@ -1013,7 +1244,6 @@ def ranker_agent(state: AgentState) -> AgentState:
     if not solutions:
         logger.warning("[RANKER] No solutions to rank")
         return {
-            **state,
             "ranked_solutions": [],
             "stage": "ranking_complete"
         }
@@ -1027,22 +1257,32 @@ def ranker_agent(state: AgentState) -> AgentState:
         f"simplicity={weights.simplicity}"
     )
     
-    # Calcular score para cada solução
-    ranked_solutions: List[RankedSolution] = []
+    # Calcular scores de todas as soluções de uma vez
+    rank_scores = calculate_rank_scores(solutions_to_soa(solutions), weights)
     
-    for solution in solutions:
-        rank_score = calculate_rank_score(solution, weights)
-        
-        ranked_solution = RankedSolution(
-            **solution.dict(),
-            rank_score=rank_score,
-            weights=weights.dict()
+    # rank_score é calculado aqui (não vem validado): mesma faixa do modelo
+    if not ((rank_scores >= 0.0) & (rank_scores <= 1.0)).all():
+        raise ValueError(
+            f"rank_score fora de [0, 1] (pesos somam "
+            f"{sum(weights.model_dump().values()):.3f})"
         )
-        
-        ranked_solutions.append(ranked_solution)
     
-    # Ordenar por score (maior primeiro)
-    ranked_solutions.sort(key=lambda s: s.rank_score, reverse=True)
+    # Ordenar por score (maior primeiro; estável em empates)
+    order = np.argsort(-rank_scores, kind="stable")
+    
+    # Solution já validada: copiar campos sem revalidar, mas sem
+    # compartilhar objetos mutáveis entre as soluções rankeadas
+    ranked_solutions: List[RankedSolution] = [
+        RankedSolution.model_construct(
+            **{
+                **dict(solutions[i]),
+                "impact_analysis": solutions[i].impact_analysis.model_copy(deep=True)
+            },
+            rank_score=float(rank_scores[i]),
+            weights=weights.model_dump()
+        )
+        for i in order
+    ]
     
     # Logar top 3
     logger.info("[RANKER] Top 3 solutions:")
@@ -1052,20 +1292,16 @@ def ranker_agent(state: AgentState) -> AgentState:
             f"{sol.description[:50]}..."
         )
     
-    elapsed = (datetime.now() - start_time).total_seconds()
+    elapsed = time.perf_counter() - start_time
     
     logger.info(
         f"[RANKER] Ranked {len(ranked_solutions)} solutions in {elapsed:.2f}s"
     )
     
     return {
-        **state,
         "ranked_solutions": ranked_solutions,
         "stage": "ranking_complete",
-        "timestamps": {
-            **state.get("timestamps", {}),
-            "ranking_complete": datetime.now()
-        }
+        "timestamps": {"ranking_complete": datetime.now()}
     }
 
 
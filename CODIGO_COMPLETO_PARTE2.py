@@ -11,11 +11,12 @@ a execução de todos os agentes de forma declarativa.
 """
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
-from typing import Literal
+from typing import Any, Literal
+from uuid import uuid4
 
 from .models.state import AgentState, create_initial_state
 from .agents.consolidator import consolidator_agent
-from .agents.detector import detector_agent
+from .agents.detector import detector_agent, consolidate_and_detect_agent
 from .agents.generator import generator_agent
 from .agents.ranker import ranker_agent
 from .agents.learning import (
@@ -23,6 +24,7 @@ from .agents.learning import (
     pattern_analyzer_agent,
     weight_adjuster_agent
 )
+from .utils.supabase_client import fetch_project_data
 
 import logging
 
@@ -33,6 +35,20 @@ logger = logging.getLogger(__name__)
 # ROUTING FUNCTIONS (Conditional Edges)
 # ============================================================================
 
+def route_entry(state: AgentState) -> Literal["feedback", "analyze"]:
+    """
+    Decide o ponto de entrada do grafo.
+    
+    Se trigger_pattern_analysis == True (feedback submetido) → "feedback"
+    Caso contrário → "analyze" (consolidação + detecção)
+    """
+    if state.get("trigger_pattern_analysis", False):
+        logger.info("[ROUTER] Feedback received, entering learning loop")
+        return "feedback"
+    
+    return "analyze"
+
+
 def should_generate_solutions(state: AgentState) -> Literal["generate", "end"]:
     """
     Decide se deve gerar soluções baseado em conflitos detectados.
@@ -43,7 +59,7 @@ def should_generate_solutions(state: AgentState) -> Literal["generate", "end"]:
     conflicts = state.get("conflicts", [])
     
     if len(conflicts) > 0:
-        logger.info(f"[ROUTER] {len(conflicts)} conflicts detected, generating solutions")
+        logger.info("[ROUTER] %d conflicts detected, generating solutions", len(conflicts))
         return "generate"
     else:
         logger.info("[ROUTER] No conflicts detected, ending workflow")
@@ -62,7 +78,7 @@ def should_continue_iteration(state: AgentState) -> Literal["detect", "end"]:
     trigger = state.get("trigger_pattern_analysis", False)
     
     if iterations < 3 and trigger:
-        logger.info(f"[ROUTER] Iteration {iterations + 1}/3, re-running detection with new weights")
+        logger.info("[ROUTER] Iteration %d/3, re-running detection with new weights", iterations + 1)
         return "detect"
     else:
         logger.info("[ROUTER] Max iterations reached or no trigger, ending")
@@ -73,17 +89,22 @@ def should_continue_iteration(state: AgentState) -> Literal["detect", "end"]:
 # WORKFLOW BUILDER
 # ============================================================================
 
-def create_workflow() -> StateGraph:
+def create_workflow(fuse_detection: bool = True) -> StateGraph:
     """
     Cria e compila o workflow LangGraph.
     
+    Args:
+        fuse_detection: Se True (padrão), consolidação e detecção rodam
+            no nó único "consolidate_and_detect". False mantém os nós
+            separados "consolidate" → "detect" (útil para depuração).
+    
     Estrutura do Grafo:
     
     START
       ↓
     consolidate (Agente 1)
       ↓
-    detect (Agente 2)
+    detect (Agente 2)           ← fundidos em consolidate_and_detect
       ↓
     [conditional: tem conflitos?]
       ├─ Sim → generate (Agente 3)
@@ -95,8 +116,10 @@ def create_workflow() -> StateGraph:
       └─ Não → END
     
     
-    Loop de Feedback (separado):
+    Loop de Feedback (entrada quando trigger_pattern_analysis == True):
     
+    START
+      ↓
     feedback (Agente 6)
       ↓
     analyze_patterns (Agente 7)
@@ -115,12 +138,15 @@ def create_workflow() -> StateGraph:
     # ADICIONAR NÓS (Agentes)
     # ========================================================================
     
-    workflow.add_node("consolidate", consolidator_agent)
-    workflow.add_node("detect", detector_agent)
+    if fuse_detection:
+        workflow.add_node("consolidate_and_detect", consolidate_and_detect_agent)
+    else:
+        workflow.add_node("consolidate", consolidator_agent)
+    workflow.add_node("detect", detector_agent)  # Também usado pelo loop de feedback
     workflow.add_node("generate", generator_agent)
     workflow.add_node("rank", ranker_agent)
     
-    # Agentes de feedback (executados separadamente)
+    # Agentes de feedback (entrada condicional)
     workflow.add_node("feedback", feedback_agent)
     workflow.add_node("analyze_patterns", pattern_analyzer_agent)
     workflow.add_node("adjust_weights", weight_adjuster_agent)
@@ -129,30 +155,43 @@ def create_workflow() -> StateGraph:
     # DEFINIR ENTRY POINT
     # ========================================================================
     
-    workflow.set_entry_point("consolidate")
+    # Análise nova → consolidação; feedback submetido → loop de aprendizado
+    workflow.set_conditional_entry_point(
+        route_entry,
+        {
+            "analyze": "consolidate_and_detect" if fuse_detection else "consolidate",
+            "feedback": "feedback"
+        }
+    )
     
     # ========================================================================
     # ADICIONAR EDGES (Fluxo)
     # ========================================================================
     
     # Pipeline principal (sequencial)
-    workflow.add_edge("consolidate", "detect")
+    if fuse_detection:
+        detection_nodes = ["consolidate_and_detect", "detect"]
+    else:
+        workflow.add_edge("consolidate", "detect")
+        detection_nodes = ["detect"]
     
     # Conditional: se tem conflitos, gerar soluções
-    workflow.add_conditional_edges(
-        "detect",
-        should_generate_solutions,
-        {
-            "generate": "generate",
-            "end": END
-        }
-    )
+    # ("detect" sempre roteia: o loop de feedback volta para ele)
+    for detection_node in detection_nodes:
+        workflow.add_conditional_edges(
+            detection_node,
+            should_generate_solutions,
+            {
+                "generate": "generate",
+                "end": END
+            }
+        )
     
     workflow.add_edge("generate", "rank")
     workflow.add_edge("rank", END)
     
     # ========================================================================
-    # FEEDBACK LOOP (executado via invoke separado)
+    # FEEDBACK LOOP (executado via invoke com trigger_pattern_analysis)
     # ========================================================================
     
     workflow.add_edge("feedback", "analyze_patterns")
@@ -171,17 +210,19 @@ def create_workflow() -> StateGraph:
     return workflow
 
 
-def compile_workflow(checkpointer=None) -> any:
+def compile_workflow(checkpointer=None, fuse_detection: bool = True) -> Any:
     """
     Compila o workflow para execução.
     
     Args:
         checkpointer: Opcional. MemorySaver para persistência de estado.
+        fuse_detection: Opcional. False separa consolidação e detecção
+            em dois nós (depuração).
     
     Returns:
         App compilado pronto para .invoke() ou .ainvoke()
     """
-    workflow = create_workflow()
+    workflow = create_workflow(fuse_detection=fuse_detection)
     
     # Compilar com checkpointing (persistência)
     app = workflow.compile(
@@ -203,7 +244,8 @@ async def run_analysis(
     start_date,
     end_date,
     callback_url=None,
-    execution_id=None
+    execution_id=None,
+    app_graph=None
 ) -> AgentState:
     """
     Executa análise completa de recursos.
@@ -214,13 +256,12 @@ async def run_analysis(
         end_date: Data de fim
         callback_url: URL para callback (opcional)
         execution_id: ID de execução (opcional, gera automaticamente)
+        app_graph: Workflow já compilado (opcional). A API passa o grafo
+            do startup; sem ele, compila um com MemorySaver.
     
     Returns:
         Estado final após execução completa
     """
-    from uuid import uuid4
-    from .utils.supabase_client import fetch_project_data
-    
     # Gerar execution_id se não fornecido
     if not execution_id:
         execution_id = str(uuid4())
@@ -235,21 +276,21 @@ async def run_analysis(
     )
     
     # Buscar dados do Supabase
-    logger.info(f"[WORKFLOW] Fetching project data for execution {execution_id}")
+    logger.info("[WORKFLOW] Fetching project data for execution %s", execution_id)
     project_data = await fetch_project_data(project_ids, start_date, end_date)
     
     initial_state["projects"] = project_data["projects"]
     initial_state["resources"] = project_data["resources"]
     initial_state["assignments"] = project_data["assignments"]
     
-    # Compilar workflow com checkpointing
-    checkpointer = MemorySaver()
-    app = compile_workflow(checkpointer=checkpointer)
+    # Compilar workflow com checkpointing (apenas se não fornecido)
+    if app_graph is None:
+        app_graph = compile_workflow(checkpointer=MemorySaver())
     
     # Executar workflow
-    logger.info(f"[WORKFLOW] Starting execution {execution_id}")
+    logger.info("[WORKFLOW] Starting execution %s", execution_id)
     
-    final_state = await app.ainvoke(
+    final_state = await app_graph.ainvoke(
         initial_state,
         config={
             "configurable": {
@@ -259,10 +300,12 @@ async def run_analysis(
     )
     
     logger.info(
-        f"[WORKFLOW] Execution {execution_id} completed. "
-        f"Stage: {final_state['stage']}, "
-        f"Conflicts: {final_state.get('total_conflicts', 0)}, "
-        f"Solutions: {final_state.get('total_solutions', 0)}"
+        "[WORKFLOW] Execution %s completed. "
+        "Stage: %s, Conflicts: %d, Solutions: %d",
+        execution_id,
+        final_state["stage"],
+        final_state.get("total_conflicts", 0),
+        final_state.get("total_solutions", 0)
     )
     
     return final_state
@@ -311,38 +354,136 @@ Endpoints:
 - GET /status/{execution_id} - Consultar status de execução
 - POST /simulate - Simular cenário hipotético
 """
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, Field
-from typing import List, Optional, Literal
+from typing import AsyncIterator, Dict, List, Optional, Literal, Tuple
 from datetime import date, datetime
 from uuid import uuid4
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from supabase import create_client, Client
+import anyio
+import asyncio
+import httpx
 import logging
+import orjson
+import os
+import queue
+import time
+
+try:
+    # Loop libuv (C); fallback para workers que não o selecionam sozinhos
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 from .workflow import run_analysis, compile_workflow
 from .models.state import AgentState, Feedback
-from .utils.supabase_client import save_results, notify_callback
+from .agents.simulator import simulate_scenario_logic
+from .utils.supabase_client import save_results, save_feedback
 
 # Setup logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "info").upper())
 logger = logging.getLogger(__name__)
 
+
+# ============================================================================
+# LIFESPAN (STARTUP/SHUTDOWN)
+# ============================================================================
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Inicialização e encerramento do serviço"""
+    logger.info("[API] LangGraph Resource Manager starting up...")
+    
+    # Logs: escrita (I/O) dos handlers em thread própria, fora do event
+    # loop. A mensagem ainda é formatada na thread que loga.
+    root_logger = logging.getLogger()
+    original_handlers = root_logger.handlers[:]
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(
+        log_queue, *original_handlers, respect_handler_level=True
+    )
+    root_logger.handlers = [QueueHandler(log_queue)]
+    log_listener.start()
+    
+    try:
+        # Clientes criados uma vez: TLS, DNS e auth amortizados entre requisições
+        app.state.supabase = create_client(
+            os.environ["SUPABASE_URL"],
+            os.environ["SUPABASE_SERVICE_ROLE_KEY"]
+        )
+        app.state.http = httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+        
+        # Threads para código síncrono: rotas def/run_in_threadpool (AnyIO)
+        # e asyncio.to_thread (agentes, /simulate). Mais threads = mais
+        # concorrência, ao custo de memória (~8 MB de stack por thread).
+        threadpool_tokens = int(os.getenv("STARLETTE_THREADPOOL_TOKENS", "100"))
+        anyio.to_thread.current_default_thread_limiter().total_tokens = threadpool_tokens
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=threadpool_tokens)
+        )
+        
+        try:
+            # Checkpointer persistente + grafo compilado uma única vez
+            async with AsyncSqliteSaver.from_conn_string(
+                os.getenv("CHECKPOINT_DB_PATH", "checkpoints.db")
+            ) as checkpointer:
+                app.state.checkpointer = checkpointer
+                app.state.graph = compile_workflow(checkpointer=checkpointer)
+                
+                yield
+        
+        finally:
+            logger.info("[API] LangGraph Resource Manager shutting down...")
+            await app.state.http.aclose()
+            # Aguarda as threads em outra thread, sem bloquear o loop
+            await asyncio.get_running_loop().shutdown_default_executor()
+    
+    finally:
+        log_listener.stop()  # Esvazia a fila antes de sair
+        root_logger.handlers = original_handlers
+
+
 # Create FastAPI app
 app = FastAPI(
     title="LangGraph Resource Manager",
     description="Multi-agent system for construction resource management",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# CORS
+# CORS: apenas o frontend (lista separada por vírgulas)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure properly in production
+    allow_origins=[
+        origin.strip()
+        for origin in os.getenv(
+            "FRONTEND_ORIGIN", "http://localhost:5173,http://localhost:5175"
+        ).split(",")
+        if origin.strip()
+    ],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    expose_headers=["X-Execution-Id"],  # Header do /analyze/stream legível no browser
+    max_age=86400,  # Cache do preflight (24h)
 )
 
+# Compressão (respostas >= 1 KB)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
 # ============================================================================
 # REQUEST/RESPONSE MODELS
@@ -350,7 +491,7 @@ app.add_middleware(
 
 class AnalysisRequest(BaseModel):
     """Request para iniciar análise"""
-    project_ids: List[str] = Field(..., min_items=1)
+    project_ids: List[str] = Field(..., min_length=1)
     start_date: date
     end_date: date
     callback_url: Optional[str] = None
@@ -408,6 +549,67 @@ class SimulationResponse(BaseModel):
     delta: dict
 
 
+# ============================================================================
+# CACHE EM PROCESSO
+# ============================================================================
+
+# /status é consultado várias vezes por segundo (n8n, frontend)
+STATUS_CACHE_TTL = 2.0  # segundos
+STATUS_CACHE_MAX_SIZE = 10_000
+_status_cache: Dict[str, Tuple[float, StatusResponse]] = {}
+
+# Análises em andamento: chave da requisição → execution_id
+_inflight_analyses: Dict[tuple, str] = {}
+
+# Callbacks simultâneos por processo (sockets no pool do httpx)
+CALLBACK_MAX_CONCURRENCY = 32
+CALLBACK_MAX_ATTEMPTS = 3
+_callback_semaphore = asyncio.Semaphore(CALLBACK_MAX_CONCURRENCY)
+
+
+def _cache_status(
+    execution_id: str,
+    status: StatusResponse,
+    expires_at: float
+) -> None:
+    """Guarda status no cache (descarta o mais antigo se cheio)"""
+    if (
+        execution_id not in _status_cache
+        and len(_status_cache) >= STATUS_CACHE_MAX_SIZE
+    ):
+        _status_cache.pop(next(iter(_status_cache)))
+    _status_cache[execution_id] = (expires_at, status)
+
+
+def _analysis_key(
+    project_ids: List[str],
+    start_date: date,
+    end_date: date,
+    callback_url: Optional[str]
+) -> tuple:
+    """Chave de deduplicação do /analyze"""
+    return (tuple(sorted(project_ids)), start_date, end_date, callback_url)
+
+
+# ============================================================================
+# DEPENDENCIES
+# ============================================================================
+
+def get_supabase(req: Request) -> Client:
+    """Cliente Supabase compartilhado (criado no startup)"""
+    return req.app.state.supabase
+
+
+def get_http(req: Request) -> httpx.AsyncClient:
+    """Cliente HTTP compartilhado (keep-alive entre requisições)"""
+    return req.app.state.http
+
+
+def get_graph(req: Request):
+    """Workflow compilado no startup (checkpointer persistente)"""
+    return req.app.state.graph
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -422,21 +624,30 @@ async def root():
     }
 
 
-@app.post("/analyze", response_model=AnalysisResponse)
+@app.post("/analyze", response_model=AnalysisResponse, status_code=202)
 async def analyze_resources(
     request: AnalysisRequest,
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    supabase: Client = Depends(get_supabase),
+    http: httpx.AsyncClient = Depends(get_http),
+    app_graph=Depends(get_graph)
 ):
     """
     Inicia análise de recursos para projetos especificados.
     
+    Retorna imediatamente (202) com o execution_id; o workflow roda
+    em background e o resultado chega via Supabase/callback.
+    
     Fluxo:
     1. Valida input
     2. Gera execution_id
-    3. Executa workflow LangGraph (assíncrono)
-    4. Salva resultados no Supabase
-    5. Envia callback (se fornecido)
-    6. Retorna execution_id
+    3. Agenda workflow LangGraph (background task)
+    4. Retorna execution_id
+    
+    Em background (run_analysis_and_save):
+    5. Executa workflow
+    6. Salva resultados no Supabase
+    7. Envia callback (se fornecido)
     
     Exemplo:
         POST /analyze
@@ -447,52 +658,103 @@ async def analyze_resources(
           "callback_url": "https://frontend.com/api/callback"
         }
     """
-    try:
-        # Gerar execution ID
-        execution_id = str(uuid4())
-        
-        logger.info(
-            f"[API] Starting analysis {execution_id} for "
-            f"{len(request.project_ids)} projects"
+    # Retry de uma análise ainda em andamento: devolver o mesmo ID
+    request_key = _analysis_key(
+        request.project_ids,
+        request.start_date,
+        request.end_date,
+        request.callback_url
+    )
+    execution_id = _inflight_analyses.get(request_key)
+    
+    if execution_id is not None:
+        logger.info("[API] Analysis %s already in progress", execution_id)
+        return AnalysisResponse(
+            success=True,
+            execution_id=execution_id,
+            message="Analysis already in progress",
+            total_conflicts=0,
+            total_solutions=0,
+            stage="queued"
         )
-        
-        # Executar análise (síncrono por enquanto, pode ser background task)
+    
+    # Gerar execution ID
+    execution_id = str(uuid4())
+    _inflight_analyses[request_key] = execution_id
+    
+    logger.info(
+        "[API] Queued analysis %s for %d projects",
+        execution_id,
+        len(request.project_ids)
+    )
+    
+    background_tasks.add_task(
+        run_analysis_and_save,
+        project_ids=request.project_ids,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        callback_url=request.callback_url,
+        execution_id=execution_id,
+        supabase=supabase,
+        http=http,
+        app_graph=app_graph
+    )
+    
+    return AnalysisResponse(
+        success=True,
+        execution_id=execution_id,
+        message="Analysis queued",
+        total_conflicts=0,
+        total_solutions=0,
+        stage="queued"
+    )
+
+
+@app.post("/analyze/stream")
+async def analyze_resources_stream(
+    request: AnalysisRequest,
+    supabase: Client = Depends(get_supabase),
+    app_graph=Depends(get_graph)
+):
+    """
+    Executa a análise e transmite as soluções rankeadas em NDJSON.
+    
+    Uma solução por linha, serializada à medida que é enviada. O
+    execution_id vai no header X-Execution-Id; os resultados são
+    salvos no Supabase após o envio. O /analyze (resumo + callback)
+    continua sendo o endpoint usado pelo n8n.
+    """
+    execution_id = str(uuid4())
+    
+    logger.info("[API] Starting streamed analysis %s", execution_id)
+    
+    try:
         result = await run_analysis(
             project_ids=request.project_ids,
             start_date=request.start_date,
             end_date=request.end_date,
             callback_url=request.callback_url,
-            execution_id=execution_id
-        )
-        
-        # Salvar resultados no Supabase
-        await save_results(result)
-        
-        # Enviar callback se fornecido
-        if request.callback_url:
-            background_tasks.add_task(
-                notify_callback,
-                request.callback_url,
-                execution_id,
-                result
-            )
-        
-        return AnalysisResponse(
-            success=True,
             execution_id=execution_id,
-            message="Analysis completed successfully",
-            total_conflicts=result.get("total_conflicts", 0),
-            total_solutions=result.get("total_solutions", 0),
-            stage=result.get("stage", "unknown")
+            app_graph=app_graph
         )
-        
     except Exception as e:
-        logger.error(f"[API] Error in analysis: {str(e)}")
+        logger.error("[API] Error in streamed analysis %s: %s", execution_id, e)
         raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(
+        aiter_solutions(result),
+        media_type="application/x-ndjson",
+        headers={"X-Execution-Id": execution_id},
+        background=BackgroundTask(save_results, result, client=supabase)
+    )
 
 
 @app.post("/feedback", response_model=FeedbackResponse)
-async def submit_feedback(request: FeedbackRequest):
+async def submit_feedback(
+    request: FeedbackRequest,
+    supabase: Client = Depends(get_supabase),
+    app_graph=Depends(get_graph)
+):
     """
     Submete feedback sobre uma solução.
     
@@ -500,11 +762,12 @@ async def submit_feedback(request: FeedbackRequest):
     do checkpoint salvo.
     
     Fluxo:
-    1. Salva feedback no Supabase
-    2. Carrega estado salvo (checkpoint)
-    3. Adiciona feedback ao estado
-    4. Continua execução (feedback → patterns → weights → detect)
-    5. Retorna resultado
+    1. Carrega estado salvo (checkpoint)
+    2. Recusa (409) se a execução ainda está rodando
+    3. Salva feedback no Supabase
+    4. Adiciona feedback ao estado
+    5. Continua execução (feedback → patterns → weights → detect)
+    6. Retorna resultado
     
     Exemplo:
         POST /feedback
@@ -519,12 +782,13 @@ async def submit_feedback(request: FeedbackRequest):
     """
     try:
         logger.info(
-            f"[API] Received feedback for solution {request.solution_id} "
-            f"(execution {request.execution_id})"
+            "[API] Received feedback for solution %s (execution %s)",
+            request.solution_id,
+            request.execution_id
         )
         
-        # Criar objeto Feedback
-        feedback = Feedback(
+        # Criar objeto Feedback (campos já validados pelo FeedbackRequest)
+        feedback = Feedback.model_construct(
             solution_id=request.solution_id,
             accepted=request.accepted,
             manager_rating=request.manager_rating,
@@ -537,54 +801,103 @@ async def submit_feedback(request: FeedbackRequest):
             context=request.context
         )
         
-        # Salvar feedback no Supabase
-        from .utils.supabase_client import save_feedback
-        await save_feedback(feedback)
-        
         # Carregar estado salvo (checkpoint)
-        from langgraph.checkpoint.memory import MemorySaver
-        checkpointer = MemorySaver()
-        app_graph = compile_workflow(checkpointer=checkpointer)
+        config = {"configurable": {"thread_id": request.execution_id}}
+        snapshot = await app_graph.aget_state(config)
         
-        # TODO: Implementar load_checkpoint
-        # state = load_checkpoint(request.execution_id)
+        # Thread vivo: escrever agora competiria com o workflow em curso
+        if snapshot.next or request.execution_id in _inflight_analyses.values():
+            raise HTTPException(
+                status_code=409,
+                detail="Execution still running; submit feedback after it completes"
+            )
+        
+        # Salvar feedback no Supabase
+        await save_feedback(feedback, client=supabase)
+        
+        if not snapshot.values:
+            return FeedbackResponse(
+                success=True,
+                message="Feedback submitted; no checkpoint to continue",
+                continued=False
+            )
         
-        # Por enquanto, apenas salvar feedback
-        # Futura implementação: continuar execução com estado carregado
+        # Reentrar no grafo pelo loop de aprendizado
+        # (route_entry → feedback → analyze_patterns → adjust_weights → detect)
+        await app_graph.ainvoke(
+            {
+                "feedback_history": [
+                    *snapshot.values.get("feedback_history", []),
+                    feedback
+                ],
+                "trigger_pattern_analysis": True
+            },
+            config=config
+        )
         
         return FeedbackResponse(
             success=True,
             message="Feedback submitted successfully",
-            continued=False  # Será True quando implementar continuação
+            continued=True
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"[API] Error submitting feedback: {str(e)}")
+        logger.error("[API] Error submitting feedback: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/status/{execution_id}", response_model=StatusResponse)
-async def get_status(execution_id: str):
+async def get_status(execution_id: str, app_graph=Depends(get_graph)):
     """
     Consulta status de uma execução.
     
-    Retorna informações sobre o estado atual da análise.
+    Retorna informações sobre o estado atual da análise, lidas do
+    checkpoint e mantidas em cache por STATUS_CACHE_TTL segundos.
     """
+    now = time.monotonic()
+    cached = _status_cache.get(execution_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    
     try:
-        # TODO: Implementar consulta ao checkpoint/database
-        # Por enquanto, retorno mock
-        
-        return StatusResponse(
+        snapshot = await app_graph.aget_state(
+            {"configurable": {"thread_id": execution_id}}
+        )
+    except Exception as e:
+        logger.error("[API] Error reading checkpoint for %s: %s", execution_id, e)
+        raise HTTPException(status_code=500, detail="Error reading execution status")
+    
+    values = snapshot.values
+    
+    if values:
+        timestamps = values.get("timestamps", {})
+        status = StatusResponse(
+            execution_id=execution_id,
+            stage=values.get("stage", "unknown"),
+            total_conflicts=values.get("total_conflicts"),
+            total_solutions=values.get("total_solutions"),
+            completed_at=(
+                max(timestamps.values())
+                if timestamps and not snapshot.next else None
+            )
+        )
+    elif execution_id in _inflight_analyses.values():
+        # Agendada, mas o workflow ainda não gravou checkpoint
+        status = StatusResponse(
             execution_id=execution_id,
-            stage="completed",
+            stage="queued",
             total_conflicts=None,
             total_solutions=None,
             completed_at=None
         )
-        
-    except Exception as e:
-        logger.error(f"[API] Error getting status: {str(e)}")
+    else:
         raise HTTPException(status_code=404, detail="Execution not found")
+    
+    _cache_status(execution_id, status, now + STATUS_CACHE_TTL)
+    
+    return status
 
 
 @app.post("/simulate", response_model=SimulationResponse)
@@ -609,11 +922,11 @@ async def simulate_scenario(request: SimulationRequest):
         }
     """
     try:
-        from .agents.simulator import simulate_scenario_logic
+        logger.info("[API] Simulating scenario: %s", request.scenario_type)
         
-        logger.info(f"[API] Simulating scenario: {request.scenario_type}")
-        
-        result = simulate_scenario_logic(
+        # CPU-bound: roda fora do event loop
+        result = await asyncio.to_thread(
+            simulate_scenario_logic,
             scenario_type=request.scenario_type,
             baseline_conflicts=request.baseline_conflicts,
             params=request.params
@@ -622,7 +935,7 @@ async def simulate_scenario(request: SimulationRequest):
         return SimulationResponse(**result)
         
     except Exception as e:
-        logger.error(f"[API] Error in simulation: {str(e)}")
+        logger.error("[API] Error in simulation: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -630,36 +943,146 @@ async def simulate_scenario(request: SimulationRequest):
 # HELPER FUNCTIONS
 # ============================================================================
 
+async def aiter_solutions(result: AgentState) -> AsyncIterator[bytes]:
+    """Uma linha NDJSON por solução rankeada"""
+    for solution in result.get("ranked_solutions", []):
+        yield orjson.dumps(solution.model_dump()) + b"\n"
+
+
+async def notify_callback(
+    callback_url: str,
+    execution_id: str,
+    result: AgentState,
+    client: httpx.AsyncClient
+) -> None:
+    """
+    Envia o resultado ao callback_url usando o cliente HTTP compartilhado.
+    
+    Concorrência limitada por _callback_semaphore; erros de rede e 5xx
+    são retentados com backoff exponencial (0.5s, 1s, ...).
+    """
+    body = orjson.dumps({
+        "execution_id": execution_id,
+        "stage": result.get("stage"),
+        "total_conflicts": result.get("total_conflicts", 0),
+        "total_solutions": result.get("total_solutions", 0),
+        "ranked_solutions": [
+            solution.model_dump()
+            for solution in result.get("ranked_solutions", [])
+        ]
+    })
+    
+    async with _callback_semaphore:
+        for attempt in range(1, CALLBACK_MAX_ATTEMPTS + 1):
+            try:
+                response = await client.post(
+                    callback_url,
+                    content=body,
+                    headers={"Content-Type": "application/json"},
+                    timeout=10
+                )
+                if response.status_code < 500:
+                    response.raise_for_status()
+                    return
+            except httpx.TransportError as e:
+                if attempt == CALLBACK_MAX_ATTEMPTS:
+                    raise
+                logger.warning(
+                    "[API] Callback for %s failed (attempt %d): %s",
+                    execution_id, attempt, e
+                )
+            else:
+                if attempt == CALLBACK_MAX_ATTEMPTS:
+                    response.raise_for_status()
+            
+            await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+
+
+async def run_analysis_and_save(
+    project_ids: List[str],
+    start_date: date,
+    end_date: date,
+    callback_url: Optional[str],
+    execution_id: str,
+    supabase: Client,
+    http: httpx.AsyncClient,
+    app_graph
+) -> None:
+    """
+    Executa o workflow fora do ciclo da requisição.
+    
+    Para durabilidade além do processo, trocar BackgroundTasks por um
+    worker (arq/Celery) consumindo de uma fila Redis.
+    """
+    try:
+        try:
+            result = await run_analysis(
+                project_ids=project_ids,
+                start_date=start_date,
+                end_date=end_date,
+                callback_url=callback_url,
+                execution_id=execution_id,
+                app_graph=app_graph
+            )
+        except Exception as e:
+            logger.error("[API] Error in analysis %s: %s", execution_id, e)
+            
+            # Falha do grafo (inclusive antes do primeiro checkpoint): status
+            # terminal fica no cache sem expirar, até ser descartado por tamanho
+            _cache_status(
+                execution_id,
+                StatusResponse(
+                    execution_id=execution_id,
+                    stage="failed",
+                    total_conflicts=None,
+                    total_solutions=None,
+                    completed_at=datetime.now()
+                ),
+                float("inf")
+            )
+            return
+        
+        try:
+            # Salvar resultados no Supabase
+            await save_results(result, client=supabase)
+            
+            # Enviar callback se fornecido
+            if callback_url:
+                await notify_callback(
+                    callback_url, execution_id, result, client=http
+                )
+            
+            logger.info("[API] Analysis %s completed", execution_id)
+            
+        except Exception as e:
+            # Grafo concluiu: checkpoint final continua válido para /status
+            logger.error("[API] Error delivering analysis %s: %s", execution_id, e)
+        
+        # Próximo /status lê o checkpoint final
+        _status_cache.pop(execution_id, None)
+    
+    finally:
+        # Estado terminal: liberar dedupe
+        _inflight_analyses.pop(
+            _analysis_key(project_ids, start_date, end_date, callback_url),
+            None
+        )
+
+
+# Fator por (aceita?, resultado); combinações ausentes valem 0.0
+_EFFECTIVENESS_FACTOR = {
+    (True, "success"): 1.0,
+    (True, "partial"): 0.7,
+}
+
+
 def calculate_effectiveness(
     accepted: bool,
     rating: int,
     result: str
 ) -> float:
     """Calcula effectiveness score baseado em feedback"""
-    if accepted and result == "success":
-        return rating / 5.0
-    elif accepted and result == "partial":
-        return (rating / 5.0) * 0.7
-    else:
-        return 0.0
-
-
-# ============================================================================
-# STARTUP/SHUTDOWN
-# ============================================================================
-
-@app.on_event("startup")
-async def startup_event():
-    """Inicialização do serviço"""
-    logger.info("[API] LangGraph Resource Manager starting up...")
-    # Inicializar conexões, cache, etc.
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Encerramento do serviço"""
-    logger.info("[API] LangGraph Resource Manager shutting down...")
-    # Fechar conexões, cleanup, etc.
+    return (rating / 5.0) * _EFFECTIVENESS_FACTOR.get((accepted, result), 0.0)
 
 
 # ============================================================================
@@ -673,8 +1096,10 @@ if __name__ == "__main__":
         "api:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,  # Development only
-        log_level="info"
+        loop="auto",  # uvloop/httptools quando instalados (uvicorn[standard])
+        http="auto",
+        reload=False,  # Hot-reload: uvicorn src.api:app --reload
+        log_level="warning"
     )
 ```
 
@@ -868,8 +1293,9 @@ pytest tests/test_workflow.py -v -s
 # Development
 uvicorn src.api:app --reload --port 8000
 
-# Production
-gunicorn src.api:app -w 4 -k uvicorn.workers.UvicornWorker
+# Production (1 worker até os checkpoints irem para PostgresSaver)
+gunicorn src.api:app -k uvicorn.workers.UvicornWorker \
+  -w 1 --timeout 120 --graceful-timeout 30
 ```
 
 ### 5. Usar API
@@ -916,7 +1342,7 @@ Cada agente é uma função pura testável:
 ```python
 def test_detector_agent():
     state = {...}
-    result = detector_agent(state)
+    result = asyncio.run(detector_agent(state))
     assert result["total_conflicts"] == expected
 ```
 
@@ -945,7 +1371,9 @@ COPY requirements.txt .
 RUN pip install -r requirements.txt
 
 COPY src/ ./src/
-CMD ["uvicorn", "src.api:app", "--host", "0.0.0.0", "--port", "8000"]
+CMD gunicorn src.api:app -k uvicorn.workers.UvicornWorker \
+    -w ${WEB_CONCURRENCY:-1} --bind 0.0.0.0:8000 \
+    --timeout 120 --graceful-timeout 30
 ```
 
 ### n8n Integration
@@ -1,7 +1,13 @@
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 import { Search, Calendar, Loader2, CheckCircle } from 'lucide-react';
 import { apiService } from '../services/api';
-import type { AnalysisRequest } from '../services/api';
+import type { AnalysisRequest, StatusResponse } from '../services/api';
+
+// /analyze responde 202 ("queued"); o progresso vem de /status
+const STATUS_POLL_INTERVAL_MS = 2000;
+
+const isFinished = (status: StatusResponse | null) =>
+    !!status && (status.completed_at !== null || status.stage === 'failed');
 
 const AnalyzeResources = () => {
     const [formData, setFormData] = useState<AnalysisRequest>({
@@ -12,13 +18,37 @@ const AnalyzeResources = () => {
     });
     const [loading, setLoading] = useState(false);
     const [result, setResult] = useState<any>(null);
+    const [status, setStatus] = useState<StatusResponse | null>(null);
     const [error, setError] = useState<string>('');
 
+    // Consulta /status até a execução terminar (concluída ou falha)
+    useEffect(() => {
+        if (!result?.execution_id || isFinished(status)) return;
+
+        const timer = setTimeout(async () => {
+            try {
+                const next = await apiService.getStatus(result.execution_id);
+                setStatus(next);
+                if (next.stage === 'failed') {
+                    setError('A análise falhou. Tente novamente.');
+                }
+            } catch (err: any) {
+                setError(err.response?.data?.detail || 'Erro ao consultar status da análise');
+                setStatus({ ...(status ?? result), completed_at: null, stage: 'failed' });
+            }
+        }, STATUS_POLL_INTERVAL_MS);
+
+        return () => clearTimeout(timer);
+    }, [result, status]);
+
+    const finished = isFinished(status) && status?.stage !== 'failed';
+
     const handleSubmit = async (e: React.FormEvent) => {
         e.preventDefault();
         setLoading(true);
         setError('');
         setResult(null);
+        setStatus(null);
 
         try {
             const response = await apiService.analyzeResources({
@@ -169,13 +199,23 @@ const AnalyzeResources = () => {
 
                     {result && (
                         <div className="space-y-4 animate-slide-up">
-                            <div className="flex items-center gap-3 p-4 bg-green-500/10 border border-green-500/50 rounded-lg">
-                                <CheckCircle className="text-green-400" size={24} />
-                                <div>
-                                    <p className="font-semibold">Análise Concluída!</p>
-                                    <p className="text-sm text-gray-400">{result.message}</p>
+                            {finished ? (
+                                <div className="flex items-center gap-3 p-4 bg-green-500/10 border border-green-500/50 rounded-lg">
+                                    <CheckCircle className="text-green-400" size={24} />
+                                    <div>
+                                        <p className="font-semibold">Análise Concluída!</p>
+                                        <p className="text-sm text-gray-400">Resultados salvos</p>
+                                    </div>
                                 </div>
-                            </div>
+                            ) : !isFinished(status) && (
+                                <div className="flex items-center gap-3 p-4 bg-primary-500/10 border border-primary-500/50 rounded-lg">
+                                    <Loader2 className="animate-spin text-primary-400" size={24} />
+                                    <div>
+                                        <p className="font-semibold">Análise em andamento...</p>
+                                        <p className="text-sm text-gray-400">{result.message}</p>
+                                    </div>
+                                </div>
+                            )}
 
                             <div className="space-y-3">
                                 <div className="glass p-4 rounded-lg">
@@ -186,17 +226,17 @@ const AnalyzeResources = () => {
                                 <div className="grid grid-cols-2 gap-3">
                                     <div className="glass p-4 rounded-lg">
                                         <p className="text-sm text-gray-400">Conflitos</p>
-                                        <p className="text-2xl font-bold text-orange-400">{result.total_conflicts}</p>
+                                        <p className="text-2xl font-bold text-orange-400">{finished ? status?.total_conflicts ?? 0 : '—'}</p>
                                     </div>
                                     <div className="glass p-4 rounded-lg">
                                         <p className="text-sm text-gray-400">Soluções</p>
-                                        <p className="text-2xl font-bold text-green-400">{result.total_solutions}</p>
+                                        <p className="text-2xl font-bold text-green-400">{finished ? status?.total_solutions ?? 0 : '—'}</p>
                                     </div>
                                 </div>
 
                                 <div className="glass p-4 rounded-lg">
                                     <p className="text-sm text-gray-400">Status</p>
-                                    <p className="font-semibold mt-1">{result.stage}</p>
+                                    <p className="font-semibold mt-1">{status?.stage ?? result.stage}</p>
                                 </div>
                             </div>
                         </div>
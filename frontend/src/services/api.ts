@@ -44,9 +44,9 @@ export interface FeedbackResponse {
 export interface StatusResponse {
     execution_id: string;
     stage: string;
-    conflicts: any[];
-    solutions: any[];
-    feedback_history: any[];
+    total_conflicts: number | null;
+    total_solutions: number | null;
+    completed_at: string | null;
 }
 
 export interface SimulationRequest {
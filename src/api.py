@@ -3,30 +3,64 @@ FastAPI Application - REST API for LangGraph Service
 
 Simple starter API to get the server running.
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+import asyncio
 import logging
+import os
+
+try:
+    # Loop libuv (C); fallback para workers que não o selecionam sozinhos
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 # Setup logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "info").upper())
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Inicialização e encerramento do serviço"""
+    logger.info("[API] LangGraph Resource Manager starting up...")
+    yield
+    logger.info("[API] LangGraph Resource Manager shutting down...")
+
+
 # Create FastAPI app
 app = FastAPI(
     title="LangGraph Resource Manager",
     description="Multi-agent system for construction resource management",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# CORS
+# CORS: apenas o frontend (lista separada por vírgulas)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure properly in production
+    allow_origins=[
+        origin.strip()
+        for origin in os.getenv(
+            "FRONTEND_ORIGIN", "http://localhost:5173,http://localhost:5175"
+        ).split(",")
+        if origin.strip()
+    ],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Content-Type", "Authorization"],
+    expose_headers=["X-Execution-Id"],  # Header do /analyze/stream legível no browser
+    max_age=86400,  # Cache do preflight (24h)
 )
 
+# Compressão (respostas >= 1 KB)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
 @app.get("/")
 async def root():
@@ -45,19 +79,6 @@ async def health_check():
     return {"status": "ok"}
 
 
-# Startup/Shutdown events
-@app.on_event("startup")
-async def startup_event():
-    """Inicialização do serviço"""
-    logger.info("[API] LangGraph Resource Manager starting up...")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Encerramento do serviço"""
-    logger.info("[API] LangGraph Resource Manager shutting down...")
-
-
 if __name__ == "__main__":
     import uvicorn
     
@@ -65,6 +86,8 @@ if __name__ == "__main__":
         "api:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
-        log_level="info"
+        loop="auto",  # uvloop/httptools quando instalados (uvicorn[standard])
+        http="auto",
+        reload=False,  # Hot-reload: uvicorn src.api:app --reload
+        log_level="warning"
     )
@@ -2,9 +2,9 @@
 Estado compartilhado entre todos os agentes.
 TypedDict garante type safety e validação.
 """
-from typing import TypedDict, List, Dict, Optional, Literal
+from typing import Annotated, Any, TypedDict, List, Dict, Optional, Literal
 from datetime import date, datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class Project(BaseModel):
@@ -27,6 +27,12 @@ class Resource(BaseModel):
     department: Optional[str] = None
     skill_tags: List[str] = []
 
+    @field_validator("email", mode="after")
+    @classmethod
+    def _normalize_email(cls, v: str) -> str:
+        """Normaliza email na construção (chave de consolidação)"""
+        return v.lower().strip()
+
 
 class Assignment(BaseModel):
     """Modelo de atribuição"""
@@ -122,7 +128,12 @@ class Feedback(BaseModel):
     manager_rating: int = Field(ge=1, le=5)
     implementation_result: Literal["success", "partial", "failed"]
     effectiveness_score: float = Field(ge=0.0, le=1.0)
-    context: Dict[str, any]
+    context: Dict[str, Any]
+
+
+def _merge_dicts(left: Dict, right: Dict) -> Dict:
+    """Reducer: nós retornam apenas as chaves novas"""
+    return {**left, **right}
 
 
 class AgentState(TypedDict, total=False):
@@ -146,10 +157,10 @@ class AgentState(TypedDict, total=False):
     weights: Weights
     ranked_solutions: List[RankedSolution]
     feedback_history: List[Feedback]
-    patterns: Dict[str, any]
+    patterns: Dict[str, Any]
     should_continue: bool
     trigger_pattern_analysis: bool
-    timestamps: Dict[str, datetime]
+    timestamps: Annotated[Dict[str, datetime], _merge_dicts]
     errors: List[str]
 
 
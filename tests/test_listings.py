@@ -0,0 +1,676 @@
+"""
+Testes do código das listagens (CODIGO_COMPLETO_PARTE1/PARTE2).
+
+Os agentes, o workflow e a API completa vivem como blocos de código
+markdown nas listagens. Cada bloco "## ... <caminho>.py" é extraído para
+um pacote temporário (`listing`) e importado como módulo real.
+
+Módulos referenciados mas não listados (learning, simulator,
+supabase_client) recebem dublês mínimos.
+"""
+import asyncio
+import importlib
+import random
+import re
+import sys
+import textwrap
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+LISTINGS = ["CODIGO_COMPLETO_PARTE1.py", "CODIGO_COMPLETO_PARTE2.py"]
+BLOCK_RE = re.compile(
+    r"^## [^\n]*?([\w/]+\.py)[^\n]*\n+```python\n(.*?)\n```\n",
+    re.S | re.M
+)
+
+DOUBLES = {
+    "agents/learning.py": """
+        async def feedback_agent(state):
+            return {"patterns": {"feedback_seen": len(state["feedback_history"])}}
+
+
+        async def pattern_analyzer_agent(state):
+            return {"stage": "patterns_analyzed"}
+
+
+        async def weight_adjuster_agent(state):
+            return {"iterations": state.get("iterations", 0) + 1}
+    """,
+    "agents/simulator.py": """
+        def simulate_scenario_logic(resource_id, new_allocations, start_date, end_date):
+            return {}
+    """,
+    "utils/supabase_client.py": """
+        async def fetch_project_data(project_ids, start_date, end_date, client=None):
+            return [], [], []
+
+
+        async def save_results(result, client=None):
+            return None
+
+
+        async def save_feedback(feedback, client=None):
+            return None
+    """,
+}
+
+
+@pytest.fixture(scope="module")
+def listing(tmp_path_factory):
+    """Materializa as listagens como pacote `listing` importável"""
+    base = tmp_path_factory.mktemp("listings")
+    package = base / "listing"
+
+    for folder in ["", "agents", "models", "utils"]:
+        (package / folder).mkdir(parents=True, exist_ok=True)
+        (package / folder / "__init__.py").touch()
+
+    for name in LISTINGS:
+        text = (ROOT / name).read_text(encoding="utf-8")
+        for path, code in BLOCK_RE.findall(text):
+            if path.startswith("tests/"):
+                continue
+            (package / path).write_text(code + "\n", encoding="utf-8")
+
+    for path, code in DOUBLES.items():
+        (package / path).write_text(textwrap.dedent(code), encoding="utf-8")
+
+    sys.path.insert(0, str(base))
+    yield "listing"
+    sys.path.remove(str(base))
+    for module in [m for m in sys.modules if m.split(".")[0] == "listing"]:
+        del sys.modules[module]
+
+
+@pytest.fixture(scope="module")
+def workflow(listing):
+    pytest.importorskip("langgraph")
+    pytest.importorskip("numpy")
+    pytest.importorskip("anthropic")
+    return importlib.import_module(f"{listing}.workflow")
+
+
+@pytest.fixture(scope="module")
+def state_models(listing):
+    pytest.importorskip("pydantic")
+    return importlib.import_module(f"{listing}.models.state")
+
+
+@pytest.fixture
+def api(workflow, listing):
+    for module in ["fastapi", "httpx", "orjson", "supabase", "langgraph.checkpoint.sqlite"]:
+        pytest.importorskip(module)
+    module = importlib.import_module(f"{listing}.api")
+    module._status_cache.clear()
+    module._inflight_analyses.clear()
+    return module
+
+
+# ============================================================================
+# AGENTES: EQUIVALÊNCIA COM O ALGORITMO ORIGINAL
+# ============================================================================
+
+SEVERITY_ORDER = {"LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
+
+
+def _random_state(state_models, seed):
+    """Recursos com emails duplicados/sujos e atribuições variadas"""
+    rnd = random.Random(seed)
+    n_resources = rnd.randint(1, 12)
+    resources = [
+        state_models.Resource(
+            id=f"res-{i}",
+            name=f"Recurso {i}",
+            email=(
+                f" USER{rnd.randint(0, n_resources // 2)}@Company.com"
+                if rnd.random() < 0.3
+                else f"user{rnd.randint(0, n_resources // 2)}@company.com"
+            ),
+            role="Engenheiro",
+            max_capacity_hours_per_day=rnd.choice([8.0, 6.0, 4.5])
+        )
+        for i in range(n_resources)
+    ]
+    assignments = []
+    for j in range(rnd.randint(0, 60)):
+        start = date(2025, 1, 1) + timedelta(days=rnd.randint(-20, 120))
+        assignments.append(
+            state_models.Assignment(
+                id=f"asn-{j}",
+                project_id=f"proj-{rnd.randint(0, 4)}",
+                # res-{n_resources} não existe: atribuição órfã
+                resource_id=f"res-{rnd.randint(0, n_resources)}",
+                task_id=f"task-{j}",
+                task_name=f"Tarefa {j}",
+                start_date=start,
+                end_date=start + timedelta(days=rnd.randint(-2, 60)),
+                allocated_units=1.0,
+                total_work_hours=rnd.choice([0.0, 10.0, 37.5, 160.0, 333.3])
+            )
+        )
+
+    state = state_models.create_initial_state(
+        execution_id=f"exec-{seed}",
+        project_ids=["proj-0"],
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 3, 31)
+    )
+    state["resources"] = resources
+    state["assignments"] = assignments
+    return state
+
+
+def _reference_consolidation(state):
+    """Agrupamento original: email minúsculo/sem espaços, órfãs descartadas"""
+    groups = {}
+    for resource in state["resources"]:
+        groups.setdefault(resource.email.lower().strip(), (resource.id, []))
+    for assignment in state["assignments"]:
+        owner = next(
+            (r for r in state["resources"] if r.id == assignment.resource_id),
+            None
+        )
+        if owner is not None:
+            groups[owner.email.lower().strip()][1].append(assignment.id)
+    return groups
+
+
+def _reference_conflicts(consolidated_resources):
+    """Detecção original, dia a dia em Python puro"""
+    conflicts = set()
+    for resource in consolidated_resources:
+        daily = {}
+        for assignment in resource.assignments:
+            days = [
+                assignment.start_date + timedelta(days=n)
+                for n in range((assignment.end_date - assignment.start_date).days + 1)
+            ]
+            business_days = [d for d in days if d.weekday() < 5]
+            if not business_days:
+                continue
+            hours_per_day = assignment.total_work_hours / len(business_days)
+            for day in business_days:
+                total, tasks = daily.get(day, (0.0, ()))
+                daily[day] = (total + hours_per_day, tasks + (assignment,))
+
+        for day, (total, tasks) in daily.items():
+            if total <= resource.capacity:
+                continue
+            percent = (total - resource.capacity) / resource.capacity * 100
+            severity = (
+                "LOW" if percent < 25 else
+                "MEDIUM" if percent < 50 else
+                "HIGH" if percent < 100 else
+                "CRITICAL"
+            )
+            conflicts.add((
+                resource.id,
+                day,
+                round(total, 2),
+                round(total - resource.capacity, 2),
+                round(percent, 1),
+                severity,
+                tuple(sorted(t.task_id for t in tasks)),
+                len({t.project_id for t in tasks})
+            ))
+    return conflicts
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_consolidate_and_detect_match_reference(listing, state_models, seed):
+    """Consolidação + detecção (numpy) equivalem ao algoritmo original"""
+    pytest.importorskip("numpy")
+    consolidator = importlib.import_module(f"{listing}.agents.consolidator")
+    detector = importlib.import_module(f"{listing}.agents.detector")
+    state = _random_state(state_models, seed)
+
+    consolidation = consolidator._consolidate(state)
+    resources = consolidation["consolidated_resources"]
+    assert {
+        r.email: (r.id, [a.id for a in r.assignments]) for r in resources
+    } == _reference_consolidation(state)
+
+    detection = detector._detect({**state, **consolidation})
+    conflicts = detection["conflicts"]
+    assert {
+        (
+            c.resource_id,
+            c.conflict_date,
+            c.allocated_hours,
+            c.overallocation_hours,
+            c.overallocation_percent,
+            c.severity,
+            tuple(sorted(t.task_id for t in c.tasks_involved)),
+            c.projects_count
+        )
+        for c in conflicts
+    } == _reference_conflicts(resources)
+    assert len(conflicts) == detection["total_conflicts"]
+
+    # Severidade e percentual decrescentes
+    keys = [(SEVERITY_ORDER[c.severity], c.overallocation_percent) for c in conflicts]
+    assert keys == sorted(keys, reverse=True)
+    assert detection["critical_conflicts"] == sum(
+        c.severity == "CRITICAL" for c in conflicts
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_ranker_matches_scalar_score(listing, state_models, seed):
+    """Scores vetorizados == calculate_rank_score; ordem decrescente estável"""
+    pytest.importorskip("numpy")
+    ranker = importlib.import_module(f"{listing}.agents.ranker")
+    rnd = random.Random(seed)
+    solutions = [
+        state_models.Solution(
+            conflict_id=f"res-1-2025-02-{i % 28 + 1:02d}",
+            strategy=rnd.choice(["REDISTRIBUTE_WITH_SLACK", "ADD_RESOURCE"]),
+            description=f"Solução {i}",
+            reasoning="Teste",
+            feasibility_score=rnd.choice([0.0, 0.25, 0.5, 0.7, 0.85, 1.0, rnd.random()]),
+            complexity_score=rnd.choice([0.0, 0.3, 0.5, 1.0, rnd.random()]),
+            preserves_deadline=rnd.random() < 0.5,
+            impact_analysis={"affected_tasks": [], "days_impact": 0, "resources_needed": 0}
+        )
+        for i in range(rnd.randint(1, 40))
+    ]
+    weights = state_models.Weights()
+
+    expected = [ranker.calculate_rank_score(s, weights) for s in solutions]
+    result = ranker.ranker_agent({
+        "execution_id": f"exec-{seed}",
+        "solutions": solutions,
+        "weights": weights
+    })
+
+    ranked = result["ranked_solutions"]
+    order = sorted(range(len(solutions)), key=lambda i: -expected[i])
+    assert [r.rank_score for r in ranked] == [expected[i] for i in order]
+    assert [r.description for r in ranked] == [solutions[i].description for i in order]
+    assert ranked[0].impact_analysis is not solutions[order[0]].impact_analysis
+
+
+# ============================================================================
+# WORKFLOW
+# ============================================================================
+
+@pytest.mark.parametrize("fuse_detection", [True, False])
+def test_compile_workflow(workflow, fuse_detection):
+    """Grafo compila nos dois modos (todos os nós alcançáveis)"""
+    app = workflow.compile_workflow(fuse_detection=fuse_detection)
+
+    nodes = set(app.get_graph().nodes)
+    assert {"feedback", "analyze_patterns", "adjust_weights"} <= nodes
+    if fuse_detection:
+        assert "consolidate_and_detect" in nodes
+    else:
+        assert {"consolidate", "detect"} <= nodes
+
+
+@pytest.mark.parametrize(
+    "trigger, expected",
+    [(False, "analyze"), (True, "feedback")]
+)
+def test_route_entry(workflow, trigger, expected):
+    """Feedback submetido entra pelo loop de aprendizado"""
+    assert workflow.route_entry({"trigger_pattern_analysis": trigger}) == expected
+
+
+def test_feedback_reenters_graph(workflow, listing):
+    """Thread concluído + feedback → feedback_agent roda e o grafo termina"""
+    from langgraph.checkpoint.memory import MemorySaver
+
+    state = importlib.import_module(f"{listing}.models.state")
+    app = workflow.compile_workflow(checkpointer=MemorySaver())
+    config = {"configurable": {"thread_id": "exec-1"}}
+    initial_state = state.create_initial_state(
+        execution_id="exec-1",
+        project_ids=["proj-1"],
+        start_date=date(2025, 2, 3),
+        end_date=date(2025, 2, 28)
+    )
+    feedback = state.Feedback.model_construct(
+        solution_id="sol-1",
+        accepted=True,
+        manager_rating=5,
+        implementation_result="success",
+        effectiveness_score=1.0,
+        context={}
+    )
+
+    async def scenario():
+        await app.ainvoke(initial_state, config=config)
+        await app.ainvoke(
+            {"feedback_history": [feedback], "trigger_pattern_analysis": True},
+            config=config
+        )
+        return await app.aget_state(config)
+
+    snapshot = asyncio.run(scenario())
+
+    assert snapshot.values["patterns"] == {"feedback_seen": 1}
+    assert snapshot.values["iterations"] == 1
+    assert not snapshot.next
+
+
+def test_generator_reuses_anthropic_client(listing, workflow, monkeypatch):
+    """Cliente Anthropic é criado uma vez e reaproveitado entre chamadas"""
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    generator = importlib.import_module(f"{listing}.agents.generator")
+    monkeypatch.setattr(generator, "_client", None)
+
+    assert generator.get_client() is generator.get_client()
+
+
+# ============================================================================
+# API: EXECUÇÃO EM BACKGROUND
+# ============================================================================
+
+class FakeGraph:
+    """Grafo compilado mínimo: snapshot fixo, registra ainvoke"""
+
+    def __init__(self, values=None, next_nodes=()):
+        self.snapshot = SimpleNamespace(values=values or {}, next=next_nodes)
+        self.invocations = []
+
+    async def aget_state(self, config):
+        return self.snapshot
+
+    async def ainvoke(self, input, config=None):
+        self.invocations.append(input)
+        return input
+
+
+def _run_in_background(api, execution_id="exec-1", callback_url=None):
+    args = (["proj-1"], date(2025, 2, 3), date(2025, 2, 28), callback_url)
+    api._inflight_analyses[api._analysis_key(*args)] = execution_id
+    asyncio.run(
+        api.run_analysis_and_save(
+            *args, execution_id, supabase=None, http=None, app_graph=None
+        )
+    )
+
+
+def test_graph_failure_caches_failed_status(api, monkeypatch):
+    """Erro do grafo → status "failed" terminal e dedupe liberado"""
+    async def failing_analysis(**kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(api, "run_analysis", failing_analysis)
+
+    _run_in_background(api)
+
+    expires_at, status = api._status_cache["exec-1"]
+    assert status.stage == "failed"
+    assert expires_at == float("inf")
+    assert not api._inflight_analyses
+
+
+def test_delivery_failure_does_not_cache_failed(api, monkeypatch):
+    """Erro no callback após o grafo → /status segue lendo o checkpoint"""
+    async def analysis(**kwargs):
+        return {"execution_id": kwargs["execution_id"]}
+
+    async def failing_callback(*args, **kwargs):
+        raise RuntimeError("callback down")
+
+    monkeypatch.setattr(api, "run_analysis", analysis)
+    monkeypatch.setattr(api, "notify_callback", failing_callback)
+    api._status_cache["exec-1"] = (0.0, None)
+
+    _run_in_background(api, callback_url="https://example.com/hook")
+
+    assert "exec-1" not in api._status_cache
+    assert not api._inflight_analyses
+
+
+def test_cache_status_update_keeps_other_entries(api, monkeypatch):
+    """Atualizar chave existente com o cache cheio não descarta outra"""
+    monkeypatch.setattr(api, "STATUS_CACHE_MAX_SIZE", 2)
+    api._cache_status("exec-1", "queued", 1.0)
+    api._cache_status("exec-2", "queued", 1.0)
+
+    api._cache_status("exec-2", "completed", 2.0)
+    assert api._status_cache == {"exec-1": (1.0, "queued"), "exec-2": (2.0, "completed")}
+
+    api._cache_status("exec-3", "queued", 3.0)
+    assert list(api._status_cache) == ["exec-2", "exec-3"]
+
+
+# ============================================================================
+# API: FEEDBACK
+# ============================================================================
+
+def _submit_feedback(api, app_graph):
+    request = api.FeedbackRequest(
+        execution_id="exec-1",
+        solution_id="sol-1",
+        accepted=True,
+        manager_rating=4,
+        implementation_result="success"
+    )
+    return asyncio.run(
+        api.submit_feedback(request, supabase=None, app_graph=app_graph)
+    )
+
+
+@pytest.mark.parametrize("inflight, next_nodes", [(False, ("rank",)), (True, ())])
+def test_feedback_on_live_thread_conflicts(api, inflight, next_nodes):
+    """Execução rodando (checkpoint com next ou em voo) → 409, grafo intocado"""
+    app_graph = FakeGraph(values={"stage": "detection_complete"}, next_nodes=next_nodes)
+    if inflight:
+        api._inflight_analyses[("key",)] = "exec-1"
+
+    with pytest.raises(api.HTTPException) as exc_info:
+        _submit_feedback(api, app_graph)
+
+    assert exc_info.value.status_code == 409
+    assert app_graph.invocations == []
+
+
+def test_feedback_resumes_finished_thread(api):
+    """Execução concluída → feedback entra pelo loop de aprendizado"""
+    app_graph = FakeGraph(values={"stage": "ranking_complete", "feedback_history": []})
+
+    response = _submit_feedback(api, app_graph)
+
+    assert response.continued is True
+    (invocation,) = app_graph.invocations
+    assert invocation["trigger_pattern_analysis"] is True
+    assert [f.solution_id for f in invocation["feedback_history"]] == ["sol-1"]
+
+
+# ============================================================================
+# API: STREAMING
+# ============================================================================
+
+def test_stream_analysis_failure_returns_500(api, monkeypatch):
+    """Erro do grafo no /analyze/stream → HTTPException 500 com detalhe"""
+    async def failing_analysis(**kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(api, "run_analysis", failing_analysis)
+    request = api.AnalysisRequest(
+        project_ids=["proj-1"],
+        start_date=date(2025, 2, 3),
+        end_date=date(2025, 2, 28)
+    )
+
+    with pytest.raises(api.HTTPException) as exc_info:
+        asyncio.run(
+            api.analyze_resources_stream(request, supabase=None, app_graph=None)
+        )
+
+    assert exc_info.value.status_code == 500
+    assert exc_info.value.detail == "boom"
+
+
+def test_cors_exposes_execution_id_header(api):
+    """Browser só lê X-Execution-Id se listado em expose_headers"""
+    (cors,) = [m for m in api.app.user_middleware if m.cls is api.CORSMiddleware]
+    assert "X-Execution-Id" in cors.kwargs["expose_headers"]
+
+
+# ============================================================================
+# API: CALLBACK
+# ============================================================================
+
+def _notify(api, monkeypatch, responses):
+    """Executa notify_callback contra respostas roteirizadas"""
+    httpx = pytest.importorskip("httpx")
+    calls = []
+    delays = []
+
+    def handler(request):
+        outcome = responses[len(calls)]
+        calls.append(request)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome)
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(api.asyncio, "sleep", fake_sleep)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            await api.notify_callback(
+                "https://example.com/hook",
+                "exec-1",
+                {"stage": "ranking_complete", "ranked_solutions": []},
+                client=client
+            )
+
+    return scenario, calls, delays
+
+
+def test_callback_retries_5xx_until_success(api, monkeypatch):
+    scenario, calls, delays = _notify(api, monkeypatch, [503, 502, 200])
+
+    asyncio.run(scenario())
+
+    assert len(calls) == 3
+    assert delays == [0.5, 1.0]
+
+
+def test_callback_raises_after_last_5xx(api, monkeypatch):
+    scenario, calls, _ = _notify(api, monkeypatch, [500, 500, 500])
+
+    with pytest.raises(api.httpx.HTTPStatusError):
+        asyncio.run(scenario())
+
+    assert len(calls) == api.CALLBACK_MAX_ATTEMPTS
+
+
+def test_callback_does_not_retry_4xx(api, monkeypatch):
+    scenario, calls, delays = _notify(api, monkeypatch, [404])
+
+    with pytest.raises(api.httpx.HTTPStatusError):
+        asyncio.run(scenario())
+
+    assert len(calls) == 1
+    assert delays == []
+
+
+def test_callback_retries_transport_errors(api, monkeypatch):
+    error = api.httpx.ConnectError("connection refused")
+    scenario, calls, _ = _notify(api, monkeypatch, [error, 200])
+
+    asyncio.run(scenario())
+
+    assert len(calls) == 2
+
+
+def test_callback_raises_after_last_transport_error(api, monkeypatch):
+    error = api.httpx.ConnectError("connection refused")
+    scenario, calls, _ = _notify(api, monkeypatch, [error, error, error])
+
+    with pytest.raises(api.httpx.ConnectError):
+        asyncio.run(scenario())
+
+    assert len(calls) == api.CALLBACK_MAX_ATTEMPTS
+
+
+# ============================================================================
+# API: STATUS
+# ============================================================================
+
+def _get_status(api, app_graph, execution_id="exec-1"):
+    return asyncio.run(api.get_status(execution_id, app_graph=app_graph))
+
+
+def test_status_queued_before_first_checkpoint(api):
+    api._inflight_analyses[("key",)] = "exec-1"
+
+    status = _get_status(api, FakeGraph())
+
+    assert status.stage == "queued"
+    assert status.completed_at is None
+
+
+def test_status_completed_from_checkpoint(api):
+    finished = datetime(2025, 2, 1, 10, 5)
+    app_graph = FakeGraph(values={
+        "stage": "ranking_complete",
+        "total_conflicts": 3,
+        "total_solutions": 7,
+        "timestamps": {
+            "detection_complete": datetime(2025, 2, 1, 10, 0),
+            "ranking_complete": finished
+        }
+    })
+
+    status = _get_status(api, app_graph)
+
+    assert (status.stage, status.total_conflicts, status.total_solutions) == (
+        "ranking_complete", 3, 7
+    )
+    assert status.completed_at == finished
+
+
+def test_status_running_has_no_completed_at(api):
+    app_graph = FakeGraph(
+        values={
+            "stage": "detection_complete",
+            "timestamps": {"detection_complete": datetime(2025, 2, 1, 10, 0)}
+        },
+        next_nodes=("generate",)
+    )
+
+    assert _get_status(api, app_graph).completed_at is None
+
+
+def test_status_failed_after_graph_error(api, monkeypatch):
+    async def failing_analysis(**kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(api, "run_analysis", failing_analysis)
+    _run_in_background(api)
+
+    status = _get_status(api, FakeGraph())
+
+    assert status.stage == "failed"
+    assert status.completed_at is not None
+
+
+def test_status_unknown_execution_is_404(api):
+    with pytest.raises(api.HTTPException) as exc_info:
+        _get_status(api, FakeGraph())
+
+    assert exc_info.value.status_code == 404
+
+
+def test_status_storage_error_is_500(api):
+    class BrokenGraph:
+        async def aget_state(self, config):
+            raise RuntimeError("database is locked")
+
+    with pytest.raises(api.HTTPException) as exc_info:
+        _get_status(api, BrokenGraph())
+
+    assert exc_info.value.status_code == 500
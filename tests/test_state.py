@@ -0,0 +1,44 @@
+"""
+Testes dos modelos de estado.
+
+- Normalização de email do Resource (chave de consolidação)
+- Reducer de timestamps do AgentState
+"""
+from datetime import datetime
+
+from src.models.state import Resource, _merge_dicts
+
+
+def test_resource_email_is_normalized():
+    """Email é normalizado (minúsculas, sem espaços) na construção"""
+    resource = Resource(
+        id="res-1",
+        name="João Silva",
+        email="  A@B.com ",
+        role="Engenheiro Civil"
+    )
+
+    assert resource.email == "a@b.com"
+
+
+def test_merge_dicts_keeps_previous_keys():
+    """Reducer mescla chaves novas sem perder as anteriores"""
+    consolidated = datetime(2025, 2, 1, 10, 0)
+    detected = datetime(2025, 2, 1, 10, 5)
+    left = {"consolidation_complete": consolidated}
+
+    merged = _merge_dicts(left, {"detection_complete": detected})
+
+    assert merged == {
+        "consolidation_complete": consolidated,
+        "detection_complete": detected
+    }
+    assert left == {"consolidation_complete": consolidated}  # Não muta a entrada
+
+
+def test_merge_dicts_right_side_wins():
+    """Chave repetida: o valor do nó mais recente prevalece"""
+    old = datetime(2025, 2, 1, 10, 0)
+    new = datetime(2025, 2, 1, 11, 0)
+
+    assert _merge_dicts({"stage": old}, {"stage": new}) == {"stage": new}